@@ -1,8 +1,7 @@
 import uvicorn
 from server import create_app
-from workers import start_worker, main_worker
+from workers import start_worker
 from contextlib import asynccontextmanager
-import threading
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,9 +11,8 @@ logger = logging.getLogger(__name__)
 async def lifespan(app):
     logger.info("Starting up the application")
 
+    # A single consumer keeps changes applied in the order they were queued
     start_worker()
-    livestate_worker = threading.Thread(target=main_worker, daemon=True)
-    livestate_worker.start()
 
     yield
 
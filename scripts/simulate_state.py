@@ -1,75 +1,117 @@
 import uuid
 import random
 import requests
+from requests.adapters import HTTPAdapter
 import time
-from typing import Dict, List
+from collections import defaultdict
+from typing import Dict, List, Optional
 
+API_URL = "http://localhost:8000"
 
-def generate_part_instance(part_id: str, batch_id: str, instance_number: int) -> Dict:
+# One pooled session so every request reuses a kept-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
+# In-warehouse part instances by part ID, loaded from the live state on first use
+# and kept up to date locally as instances are moved or used
+_components_by_part: Optional[Dict[str, List[Dict]]] = None
+
+
+def generate_part_instance(
+    part_id: str, batch_id: str, instance_number: int, now: Optional[int] = None
+) -> Dict:
+    if now is None:
+        now = int(time.time())
     return {
         "id": str(uuid.uuid4()),
         "parent_id": part_id,  # This will now be the hierarchical ID from schema
         "batch_id": batch_id,
         "status": "created",
         "location": None,
-        "created_at": int(time.time()),
-        "updated_at": int(time.time()),
+        "created_at": now,
+        "updated_at": now,
         "quality_score": round(random.uniform(0.8, 1.0), 2),
         "production_time": round(random.uniform(0.5, 5.0), 2),
     }
 
 
-def generate_batch() -> Dict:
+def generate_batch(now: Optional[int] = None) -> Dict:
+    if now is None:
+        now = int(time.time())
     return {
         "id": str(uuid.uuid4()),
         "status": "started",
-        "start_time": int(time.time()),
-        "estimated_completion": int(time.time() + random.randint(3600, 7200)),
+        "start_time": now,
+        "estimated_completion": now + random.randint(3600, 7200),
     }
 
 
-def send_state_change(change_data):
-    response = requests.post(
-        "http://localhost:8000/state/live/update", json=change_data
+def send_state_changes(changes: List[Dict]):
+    if not changes:
+        return
+    response = SESSION.post(
+        f"{API_URL}/state/live/update/batch", json={"changes": changes}
     )
-    print(f"Sent state change: {change_data['action']}")
+    print(f"Sent {len(changes)} state changes")
     print(f"Response: {response.json()}")
 
 
 def send_schema_change(change_data):
-    response = requests.post(
-        "http://localhost:8000/schema/live/update", json=change_data
-    )
+    response = SESSION.post(f"{API_URL}/schema/live/update", json=change_data)
     print(f"Sent schema change: {change_data['action']}")
     print(f"Response: {response.json()}")
 
 
-def simulate_production_cycle(schema_data: Dict):
-    # Get current state
-    response = requests.get("http://localhost:8000/state/live")
-    state_data = response.json()
+def get_raw_part_keys(schema_data: Dict) -> List[str]:
+    # Level 3 parts (raw materials) never change level, so find them once
+    return [
+        key for key, node in schema_data["nodes"]["Parts"].items() if node["level"] == 3
+    ]
+
 
-    # Get all level 3 parts (raw materials) from schema
+def simulate_production_cycle(
+    schema_data: Dict, raw_part_keys: Optional[List[str]] = None
+):
+    # Load the in-warehouse index from the current state before producing, so
+    # the instances produced below are added to it as they are moved
+    global _components_by_part
+    if _components_by_part is None:
+        _components_by_part = _load_components_index()
+
+    # Get the level 3 parts that still have units in the chain
+    if raw_part_keys is None:
+        raw_part_keys = get_raw_part_keys(schema_data)
+    parts = schema_data["nodes"]["Parts"]
     raw_parts = [
-        (node["id"], node)
-        for node in schema_data["nodes"]["Parts"].values()
-        if node["level"] == 3 and node["units_in_chain"] > 0
+        (parts[key]["id"], parts[key])
+        for key in raw_part_keys
+        if parts[key]["units_in_chain"] > 0
     ]
 
     if not raw_parts:
         print("No raw materials available for production")
         return
 
+    # One timestamp per production tick, shared by all of its changes
+    now = int(time.time())
+
     # Start production batch
-    batch = generate_batch()
+    batch = generate_batch(now)
+
+    # Index warehouse links by the part they stock, in one pass over the links
+    warehouse_links_by_part = defaultdict(list)
+    for link in schema_data["links"]:
+        if link["key"] == "WarehouseToPart":
+            warehouse_links_by_part[link["target"]].append(link)
 
     # Create raw material instances
     for part_id, part_data in raw_parts:
+        warehouse_links = warehouse_links_by_part.get(part_id)
         production_quantity = min(random.randint(50, 100), part_data["units_in_chain"])
 
         # Update schema to reduce units_in_chain
         schema_update = {
-            "timestamp": int(time.time()),
+            "timestamp": now,
             "type": "schema",
             "action": "Update",
             "data": {
@@ -87,43 +129,46 @@ def simulate_production_cycle(schema_data: Dict):
         }
         send_schema_change(schema_update)
 
-        # Create instances
+        # Create instances, collecting their changes into one batch per part
+        changes = []
         for i in range(production_quantity):
-            instance = generate_part_instance(part_id, batch["id"], i + 1)
+            instance = generate_part_instance(part_id, batch["id"], i + 1, now)
             change = {
-                "timestamp": int(time.time()),
+                "timestamp": now,
                 "type": "state",
-                "action": "Create",
-                "data": {
-                    "nodes": {"PartInstance": {instance["id"]: instance}},
+                "action": "create",
+                "payload": {
+                    # Copy, since the instance is moved before the batch is sent
+                    "nodes": {"PartInstance": {instance["id"]: {**instance}}},
                     "links": [],
                 },
             }
-            send_state_change(change)
+            changes.append(change)
 
             # Move to warehouse
-            warehouse_links = [
-                link
-                for link in schema_data["links"]
-                if link["target"] == part_id and link["key"] == "WarehouseToPart"
-            ]
             if warehouse_links:
                 warehouse = random.choice(warehouse_links)
                 instance["location"] = warehouse["source"]
                 instance["status"] = "in_warehouse"
+                _components_by_part[part_id].append(instance)
                 change = {
-                    "timestamp": int(time.time()),
+                    "timestamp": now,
                     "type": "state",
-                    "action": "Update",
-                    "data": {
+                    "action": "update",
+                    "payload": {
                         "nodes": {"PartInstance": {instance["id"]: instance}},
                         "links": [],
                     },
                 }
-                send_state_change(change)
+                changes.append(change)
+
+        send_state_changes(changes)
 
 
 def simulate_assembly_process(schema_data: Dict):
+    # One timestamp per assembly tick, shared by all of its changes
+    now = int(time.time())
+
     # Get assembly relationships
     assemblies = [
         link for link in schema_data["links"] if link["key"] == "PartComposition"
@@ -138,18 +183,19 @@ def simulate_assembly_process(schema_data: Dict):
         # Get available components
         component_instances = get_available_components(assembly["target"])
         if len(component_instances) >= assembly["quantity_required"]:
-            # Select required components
+            # Select required components; they are no longer available afterwards
             used_components = component_instances[: assembly["quantity_required"]]
+            del component_instances[: assembly["quantity_required"]]
 
             # Create new assembly instance
             assembly_instance = generate_part_instance(
-                assembly["source"], str(uuid.uuid4())
+                assembly["source"], str(uuid.uuid4()), 1, now
             )
             assembly_instance["status"] = "assembled"
 
             # Update schema to reduce units_in_chain for parent part
             schema_update = {
-                "timestamp": int(time.time()),
+                "timestamp": now,
                 "type": "schema",
                 "action": "Update",
                 "data": {
@@ -175,10 +221,10 @@ def simulate_assembly_process(schema_data: Dict):
 
             # Send updates in a single change
             change = {
-                "timestamp": int(time.time()),
+                "timestamp": now,
                 "type": "state",
-                "action": "Update",
-                "data": {
+                "action": "update",
+                "payload": {
                     "nodes": {
                         "PartInstance": {
                             **{assembly_instance["id"]: assembly_instance},
@@ -188,29 +234,36 @@ def simulate_assembly_process(schema_data: Dict):
                     "links": [],
                 },
             }
-            send_state_change(change)
+            send_state_changes([change])
 
 
-def get_available_components(part_id: str) -> List[Dict]:
-    response = requests.get("http://localhost:8000/state/live")
+def _load_components_index() -> Dict[str, List[Dict]]:
+    response = SESSION.get(f"{API_URL}/state/live")
     state_data = response.json()
 
     # Handle both old and new data structures
     nodes = state_data.get("nodes", state_data)
     part_instances = nodes.get("PartInstance", {})
 
-    return [
-        instance
-        for instance in part_instances.values()
-        if instance["part_id"] == part_id and instance["status"] == "in_warehouse"
-    ]
+    components_by_part = defaultdict(list)
+    for instance in part_instances.values():
+        if instance["status"] == "in_warehouse":
+            components_by_part[instance["parent_id"]].append(instance)
+    return components_by_part
+
+
+def get_available_components(part_id: str) -> List[Dict]:
+    global _components_by_part
+    if _components_by_part is None:
+        _components_by_part = _load_components_index()
+    return _components_by_part[part_id]
 
 
 if __name__ == "__main__":
     # Get current schema
-    response = requests.get("http://localhost:8000/schema/live")
+    response = SESSION.get(f"{API_URL}/schema/live")
     schema_data = response.json()
 
     # Simulate production and assembly
-    simulate_production_cycle(schema_data)
+    simulate_production_cycle(schema_data, get_raw_part_keys(schema_data))
     simulate_assembly_process(schema_data)
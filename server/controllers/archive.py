@@ -1,47 +1,50 @@
 import os
-import json
-import networkx as nx
-from ..config import get_paths
+from fastapi.responses import FileResponse
+from ..config import get_paths_readonly
 
 
 async def get_schema_archive_list(version: str = None):
-    paths = get_paths(version)
+    paths = get_paths_readonly(version)
+    if not os.path.isdir(paths["SCHEMAARCHIVE_PATH"]):
+        return []
     archives = os.listdir(paths["SCHEMAARCHIVE_PATH"])
     return [int(f.split(".")[0]) for f in archives]
 
 
 async def get_specific_schema_archive(timestamp: int, version: str = None):
-    paths = get_paths(version)
+    paths = get_paths_readonly(version)
     file_path = os.path.join(paths["SCHEMAARCHIVE_PATH"], f"{timestamp}.json")
     if os.path.exists(file_path):
-        with open(file_path, "r") as f:
-            return json.load(f)
+        # Archives are already JSON on disk; send the bytes without re-encoding
+        return FileResponse(file_path, media_type="application/json")
     else:
         return {"error": "Schema archive not found"}
 
 
 async def get_state_archive_list(version: str = None):
-    paths = get_paths(version)
+    paths = get_paths_readonly(version)
+    if not os.path.isdir(paths["STATEARCHIVE_PATH"]):
+        return []
     archives = os.listdir(paths["STATEARCHIVE_PATH"])
     return [int(f.split(".")[0]) for f in archives]
 
 
 async def get_specific_state_archive(timestamp: int, version: str = None):
-    paths = get_paths(version)
-    file_path = os.path.join(paths["STATEARCHIVE_PATH"], f"state_{timestamp}.json")
+    paths = get_paths_readonly(version)
+    file_path = os.path.join(paths["STATEARCHIVE_PATH"], f"{timestamp}.json")
     if os.path.exists(file_path):
-        with open(file_path, "r") as f:
-            return json.load(f)
+        return FileResponse(file_path, media_type="application/json")
     else:
         return {"error": "State archive not found"}
 
 
 async def get_specific_graphml_archive(timestamp: int, version: str = None):
-    paths = get_paths(version)
+    paths = get_paths_readonly(version)
     file_path = os.path.join(
         paths["NATIVE_FORMAT_PATH"] + "/graphml", f"{timestamp}.graphml"
     )
     if os.path.exists(file_path):
+        # Served as a JSON-encoded string, as clients of this endpoint expect
         with open(file_path, "r") as f:
             return f.read()
     else:
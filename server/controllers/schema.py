@@ -1,8 +1,6 @@
-import os
-import json
-import networkx as nx
 import logging
-from ..config import get_paths, redis_client
+from fastapi.responses import Response
+from ..config import get_paths_readonly, get_redis_client
 from ..models.change import Change
 
 logging.basicConfig(level=logging.INFO)
@@ -10,10 +8,13 @@ logger = logging.getLogger(__name__)
 
 
 async def get_live_schema(version: str = None):
-    paths = get_paths(version)
+    paths = get_paths_readonly(version)
     try:
-        with open(f"{paths['LIVESCHEMA_PATH']}/current_schema.json", "r") as f:
-            return json.load(f)
+        # The worker writes the live schema as JSON; send it without re-encoding.
+        # It is replaced on every change, so read it whole rather than streaming
+        # it by path, which could mix two versions of the file
+        with open(f"{paths['LIVESCHEMA_PATH']}/current_schema.json", "rb") as f:
+            return Response(content=f.read(), media_type="application/json")
     except FileNotFoundError:
         return {"error": "Live schema not found"}
 
@@ -21,14 +22,6 @@ async def get_live_schema(version: str = None):
 async def queue_live_schema_update(update: Change):
     logger.info(f"Queueing schema update")
 
-    # Convert Change model to dict before serializing
-    change_dict = {
-        "action": update.action,
-        "type": update.type,
-        "timestamp": update.timestamp,
-        "payload": update.payload,
-        "version": update.version,
-    }
-
-    redis_client.rpush("changes", json.dumps(change_dict))
+    # Serialize straight from the model in pydantic-core
+    get_redis_client().rpush("changes", update.model_dump_json())
     return {"status": "Schema update queued"}
@@ -1,8 +1,8 @@
 import os
 import json
 import logging
-from ..config import get_paths, redis_client
-from ..models.change import Change
+from ..config import get_paths, get_redis_client
+from ..models.change import Change, ChangeBatch
 
 logger = logging.getLogger(__name__)
 
@@ -25,5 +25,14 @@ async def get_live_state(version: str = None):
 
 
 async def queue_live_state_update(update: Change):
-    redis_client.rpush("changes", json.dumps(update))
+    get_redis_client().rpush("changes", update.model_dump_json())
     return {"status": "State update queued"}
+
+
+async def queue_live_state_updates(batch: ChangeBatch):
+    # Queue the whole batch with a single RPUSH, keeping its order
+    if batch.changes:
+        get_redis_client().rpush(
+            "changes", *(change.model_dump_json() for change in batch.changes)
+        )
+    return {"status": f"{len(batch.changes)} state updates queued"}
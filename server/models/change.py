@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal, Optional, Dict
+from typing import Literal, Optional, Dict, List
 
 
 class Change(BaseModel):
@@ -8,3 +8,7 @@ class Change(BaseModel):
     timestamp: int
     payload: Dict
     version: Optional[str] = None
+
+
+class ChangeBatch(BaseModel):
+    changes: List[Change]
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from ..controllers import state
-from ..models.change import Change
+from ..models.change import Change, ChangeBatch
 
 router = APIRouter(tags=["state"])
 
@@ -13,3 +13,8 @@ async def get_live_state(version: str):
 @router.post("/state/live/update")
 async def update_live_state(update: Change):
     return await state.queue_live_state_update(update)
+
+
+@router.post("/state/live/update/batch")
+async def update_live_state_batch(batch: ChangeBatch):
+    return await state.queue_live_state_updates(batch)
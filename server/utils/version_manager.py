@@ -1,10 +1,10 @@
 import os
-from ..config import get_paths
+from ..config import get_paths_readonly
 
 
 async def ensure_version_exists(version: str) -> None:
     """Ensures that all necessary directories exist for a given version"""
-    paths = get_paths(version)
+    paths = get_paths_readonly(version)
 
     for path in paths.values():
         if not os.path.exists(path):
@@ -2,7 +2,6 @@ import networkx as nx
 from networkx.readwrite import json_graph
 import threading
 import json
-from time import sleep
 import logging
 import uuid
 import time
@@ -19,8 +18,8 @@ logger = logging.getLogger(__name__)
 
 from server.config import (
     get_paths,
-    redis_client,
-    postgres_conn,
+    get_redis_client,
+    postgres_connection,
 )
 
 # Get default paths
@@ -33,56 +32,69 @@ NATIVE_FORMAT_PATH = paths["NATIVE_FORMAT_PATH"]
 
 CURRENT_TIMESTAMP = None
 
+# Seconds a blocking pop on the changes queue waits before retrying
+CHANGES_POP_TIMEOUT = 1
+
+# Schema change handlers by action
+SCHEMA_ACTIONS = {
+    "create": process_schema_create,
+    "update": process_schema_update,
+    "delete": process_schema_delete,
+}
+
 
 def write_to_postgres(timestamp, change_data=None):
     try:
-        cursor = postgres_conn.cursor()
-
-        # Create table if it doesn't exist
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS state_deltas (
-                timestamp BIGINT PRIMARY KEY,
-                action VARCHAR(50),
-                change_type VARCHAR(50),
-                change_data JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
+        with postgres_connection() as conn:
+            cursor = conn.cursor()
 
-        # Insert change delta
-        if change_data:
+            # Create table if it doesn't exist
             cursor.execute(
                 """
-                INSERT INTO state_deltas 
-                (timestamp, action, change_type, change_data)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (timestamp) DO NOTHING
-            """,
-                (
-                    timestamp,
-                    change_data["action"],
-                    change_data["type"],
-                    json.dumps(change_data["data"]),
-                ),
+                CREATE TABLE IF NOT EXISTS state_deltas (
+                    timestamp BIGINT PRIMARY KEY,
+                    action VARCHAR(50),
+                    change_type VARCHAR(50),
+                    change_data JSONB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
             )
 
-        postgres_conn.commit()
-        cursor.close()
+            # Insert change delta
+            if change_data:
+                cursor.execute(
+                    """
+                    INSERT INTO state_deltas 
+                    (timestamp, action, change_type, change_data)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (timestamp) DO NOTHING
+                """,
+                    (
+                        timestamp,
+                        change_data["action"],
+                        change_data["type"],
+                        json.dumps(change_data["data"]),
+                    ),
+                )
+
+            conn.commit()
+            cursor.close()
         logger.info(f"Successfully wrote delta for timestamp {timestamp}")
 
     except Exception as e:
+        # The connection is rolled back before it returns to the pool
         logger.error(f"Error writing delta to postgres: {str(e)}")
-        postgres_conn.rollback()
 
 
 def main_worker():
     logger.info("Starting main worker")
+    redis_client = get_redis_client()
     while True:
-        # Check Redis for new changes
-        latest_change = redis_client.lpop("changes")
-        if latest_change:
+        # Block until a change is queued instead of polling
+        item = redis_client.blpop("changes", timeout=CHANGES_POP_TIMEOUT)
+        if item:
+            _, latest_change = item
             change_data = json.loads(latest_change)
             version = change_data.get("version")
 
@@ -102,8 +114,6 @@ def main_worker():
             # elif change_data["type"] == "schema":
             #     process_schema_change(change_data, paths)
             process_schema_change(change_data=change_data, paths=paths)
-        else:
-            sleep(0.01)  # Wait before checking again
 
 
 def create_initial_schema_and_state(paths):
@@ -206,20 +216,13 @@ def process_schema_change(change_data, paths):
         schema_data = load_live_schema(paths)
         state_data = load_live_state(paths)
 
-        if change_data["action"] in ["create", "update", "delete"]:
-
-            if change_data["action"] == "create":
-                schema_data, state_data = process_schema_create(
-                    change_data["payload"], schema_data, state_data, CURRENT_TIMESTAMP
-                )
-            elif change_data["action"] == "update":
-                schema_data, state_data = process_schema_update(
-                    change_data["payload"], schema_data, state_data, CURRENT_TIMESTAMP
-                )
-            elif change_data["action"] == "delete":
-                schema_data, state_data = process_schema_delete(
-                    change_data["payload"], schema_data, state_data, CURRENT_TIMESTAMP
-                )
+        # Handlers update both graphs in place. They are loaded fresh for every
+        # change and discarded if processing fails, so no defensive copy is made
+        handler = SCHEMA_ACTIONS.get(change_data["action"])
+        if handler is not None:
+            schema_data, state_data = handler(
+                change_data["payload"], schema_data, state_data, CURRENT_TIMESTAMP
+            )
 
         save_graph(schema_data, paths, is_schema=True)
         save_graph(state_data, paths, is_schema=False)
@@ -1,7 +1,7 @@
 import networkx as nx
 import logging
-from copy import deepcopy
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -38,24 +38,21 @@ def process_schema_create(
     }
     """
     try:
-        schema = deepcopy(schema_data)
-        state = deepcopy(state_data)
-
         # Check if this is an edge creation
         if "source_id" in payload and "target_id" in payload:
             source_id = payload["source_id"]
             target_id = payload["target_id"]
 
             # Verify both nodes exist
-            if not schema.has_node(source_id):
+            if not schema_data.has_node(source_id):
                 raise ValueError(f"Source node {source_id} does not exist in schema")
-            if not schema.has_node(target_id):
+            if not schema_data.has_node(target_id):
                 raise ValueError(f"Target node {target_id} does not exist in schema")
 
             logger.info(f"Processing edge create: {source_id} -> {target_id}")
 
             # Add the edge with its properties
-            schema.add_edge(
+            schema_data.add_edge(
                 source_id,
                 target_id,
                 relationship_type=payload["edge_type"],
@@ -70,16 +67,16 @@ def process_schema_create(
             logger.info(f"Processing node create: {node_id}")
 
             # Verify node doesn't already exist
-            if schema.has_node(node_id):
+            if schema_data.has_node(node_id):
                 raise ValueError(f"Node {node_id} already exists in schema")
 
             # Add node with its properties
-            schema.add_node(
+            schema_data.add_node(
                 node_id, node_type=payload["node_type"], **payload["properties"]
             )
 
             # if units_in_chain is specified, add instances to state graph
-            properties = dict(payload["properties"])
+            properties = payload["properties"]
             logger.info(f"Available properties: {properties.keys()}")
             if "units_in_chain" in properties.keys():
                 units = properties.get("units_in_chain")
@@ -98,8 +95,8 @@ def process_schema_create(
                     except ValueError:
                         expiry = 0
 
-                state = update_state_instances(
-                    state_data=state,
+                state_data = update_state_instances(
+                    state_data=state_data,
                     parent_id=node_id,
                     type=payload["node_type"],
                     target_count=units,
@@ -109,7 +106,7 @@ def process_schema_create(
 
             logger.info(f"Node create complete for {node_id}")
 
-        return schema, state
+        return schema_data, state_data
 
     except KeyError as e:
         logger.error(f"Missing required field in create payload: {str(e)}")
@@ -144,25 +141,18 @@ def process_schema_update(
     Edge updates are handled through separate create/delete operations
     """
     try:
-        schema = deepcopy(schema_data)
-        state = deepcopy(state_data)
         node_id = payload["node_id"]
 
         logger.info(f"Processing schema update: {node_id}")
 
-        if not schema.has_node(node_id):
+        if not schema_data.has_node(node_id):
             raise ValueError(f"Node {node_id} does not exist in schema")
 
-        # Update node properties
-        properties = None
-        try:
-            properties = dict(payload["updates"]["properties"])
-        except KeyError:
-            pass
+        # Update node properties in place
+        properties = payload.get("updates", {}).get("properties")
 
         if properties:
-            for key, value in properties.items():
-                schema.nodes[node_id][key] = value
+            schema_data.nodes[node_id].update(properties)
 
             # if units_in_chain is specified, add instances to state graph
             if "units_in_chain" in properties.keys():
@@ -183,17 +173,17 @@ def process_schema_update(
                     except ValueError:
                         expiry = 0
 
-                state = update_state_instances(
-                    state_data=state,
+                state_data = update_state_instances(
+                    state_data=state_data,
                     parent_id=node_id,
-                    type=schema.nodes[node_id]["node_type"],
+                    type=schema_data.nodes[node_id]["node_type"],
                     target_count=units,
                     created_at=timestamp,
                     expiry=expiry,
                 )
 
         logger.info(f"Update complete for {node_id}")
-        return schema, state
+        return schema_data, state_data
 
     except KeyError as e:
         logger.error(f"Missing required field in update payload: {str(e)}")
@@ -228,9 +218,6 @@ def process_schema_delete(
     }
     """
     try:
-        schema = deepcopy(schema_data)
-        state = deepcopy(state_data)
-
         # Check if this is an edge deletion
         if "source_id" in payload and "target_id" in payload:
             source_id = payload["source_id"]
@@ -238,16 +225,16 @@ def process_schema_delete(
 
             logger.info(f"Processing edge delete: {source_id} -> {target_id}")
 
-            if not schema.has_edge(source_id, target_id):
+            if not schema_data.has_edge(source_id, target_id):
                 raise ValueError(f"Edge from {source_id} to {target_id} does not exist")
 
             # If edge_type is specified, only delete edges of that type
             if "edge_type" in payload:
-                edge_data = schema.get_edge_data(source_id, target_id)
+                edge_data = schema_data.get_edge_data(source_id, target_id)
                 if edge_data.get("relationship_type") == payload["edge_type"]:
-                    schema.remove_edge(source_id, target_id)
+                    schema_data.remove_edge(source_id, target_id)
             else:
-                schema.remove_edge(source_id, target_id)
+                schema_data.remove_edge(source_id, target_id)
 
             logger.info(f"Edge delete complete: {source_id} -> {target_id}")
 
@@ -256,20 +243,20 @@ def process_schema_delete(
             node_id = payload["node_id"]
             logger.info(f"Processing node delete: {node_id}")
 
-            if not schema.has_node(node_id):
+            if not schema_data.has_node(node_id):
                 raise ValueError(f"Node {node_id} does not exist in schema")
 
             if payload.get("cascade", False):
                 # Get all descendant nodes
-                descendants = nx.descendants(schema, node_id)
+                descendants = nx.descendants(schema_data, node_id)
                 # Remove all descendants
-                schema.remove_nodes_from(descendants)
+                schema_data.remove_nodes_from(descendants)
 
-            node_properties = schema.nodes[node_id]
+            node_properties = schema_data.nodes[node_id]
 
             if "units_in_chain" in node_properties.keys():
-                state = update_state_instances(
-                    state_data=state,
+                state_data = update_state_instances(
+                    state_data=state_data,
                     parent_id=node_id,
                     type=node_properties["node_type"],
                     target_count=0,
@@ -277,11 +264,11 @@ def process_schema_delete(
                 )
 
             # Remove the target node and all its edges
-            schema.remove_node(node_id)
+            schema_data.remove_node(node_id)
 
             logger.info(f"Node delete complete: {node_id}")
 
-        return schema, state
+        return schema_data, state_data
 
     except KeyError as e:
         logger.error(f"Missing required field in delete payload: {str(e)}")
@@ -291,6 +278,15 @@ def process_schema_delete(
         raise
 
 
+def generate_instance_ids(count: int) -> List[str]:
+    """Generate count random UUID4 strings from a single urandom draw."""
+    raw = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=raw[i : i + 16], version=4))
+        for i in range(0, 16 * count, 16)
+    ]
+
+
 # Function to find all nodes with specific attributes
 def find_nodes_with_property(graph, key, value):
     return [node for node, attr in graph.nodes(data=True) if attr.get(key) == value]
@@ -317,47 +313,38 @@ def update_state_instances(
     Returns:
         nx.DiGraph: The updated state graph.
     """
-    # Count all nodes in state data with parent ID
-    current_count = len(find_nodes_with_property(state_data, parent_id, parent_id))
+    # Collect all nodes in state data with parent ID in a single scan
+    instances = find_nodes_with_property(state_data, "parent_id", parent_id)
+    current_count = len(instances)
 
     # If there are more instances than target count, remove excess instances
     if current_count > target_count:
         excess_count = current_count - target_count
-        # remove instances by FIFO on expiry if available, otherwise by FIFO on created_at
-        for i in range(excess_count):
-            node_to_remove = sorted(
-                find_nodes_with_property(state_data, parent_id, parent_id),
-                key=lambda node: state_data.nodes[node].get(
-                    "expiry", state_data.nodes[node]["created_at"]
-                ),
-            )[i]
-            state_data.remove_node(node_to_remove)
+        if target_count > 0:
+            # remove instances by FIFO on valid_to if available, otherwise by FIFO
+            # on created_at; instances created before the worker saw a timestamp
+            # carry None and are treated as the oldest
+            def removal_order(node):
+                attributes = state_data.nodes[node]
+                expires = attributes.get("valid_to", attributes.get("created_at"))
+                return (expires is not None, expires or 0)
+
+            instances.sort(key=removal_order)
+        state_data.remove_nodes_from(instances[:excess_count])
 
         logger.info(f"Removed {excess_count} of {type} instances from state graph")
 
     elif current_count < target_count:
-        # Add instances
-        for i in range(target_count - current_count):
-            # Convert UUID to string when creating node
-            node_id = str(uuid.uuid4())
-            if expiry is not None:
-                valid_from = created_at
-                valid_to = created_at + expiry
-                state_data.add_node(
-                    node_id,  # Use string UUID
-                    parent_id=parent_id,
-                    type=type,
-                    created_at=created_at,
-                    valid_from=valid_from,
-                    valid_to=valid_to,
-                )
-            else:
-                state_data.add_node(
-                    node_id,  # Use string UUID
-                    parent_id=parent_id,
-                    type=type,
-                    created_at=created_at,
-                )
+        # Add instances in bulk; networkx copies the shared attributes per node
+        attributes = {"parent_id": parent_id, "type": type, "created_at": created_at}
+        if expiry is not None:
+            attributes["valid_from"] = created_at
+            attributes["valid_to"] = created_at + expiry
+
+        state_data.add_nodes_from(
+            (instance_id, attributes)
+            for instance_id in generate_instance_ids(target_count - current_count)
+        )
         logger.info(
             f"Added {target_count - current_count} of {type} instances to state graph"
         )